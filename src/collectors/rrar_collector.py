@@ -1,17 +1,22 @@
 """Collector for RRAR (Russian Public Relations Association Rating) 2025."""
 import requests
-from bs4 import BeautifulSoup
-import json
-from pathlib import Path
-from typing import List, Dict, Optional
+from lxml import etree
+import io
+import orjson
+from typing import List, Dict, Optional, Tuple
 import time
 
-import sys
-sys.path.insert(0, str(Path(__file__).parent.parent))
+from ..utils.logger import logger
+from ..utils.helpers import clean_text, HostRateLimiter
+from ..utils.http import create_session, cached_get
+from ..config import RAW_DATA_DIR
 
-from utils.logger import logger
-from utils.helpers import rate_limit, clean_text
-from config import RAW_DATA_DIR
+_RATE_LIMITER = HostRateLimiter(delay=2)
+
+
+def _has_class(elem, class_name: str) -> bool:
+    """Check whether lxml element has given CSS class."""
+    return class_name in (elem.get('class') or '').split()
 
 
 class RRARCollector:
@@ -28,64 +33,95 @@ class RRARCollector:
     }
     
     def __init__(self):
-        self.session = requests.Session()
-        self.session.headers.update({
+        self.session = create_session({
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
         })
         self.companies = []
     
-    @rate_limit(delay=2)
-    def fetch_page(self, url: str) -> Optional[str]:
-        """Fetch page content with rate limiting."""
+    def fetch_page(self, url: str) -> Optional[Tuple[bytes, str]]:
+        """
+        Fetch raw page bytes with caching and rate limiting.
+        
+        Returns ``(content, encoding)``: the charset comes from the
+        Content-Type header, as for ``response.text``.
+        """
         try:
             logger.info(f"Fetching: {url}")
-            response = self.session.get(url, timeout=30)
+            response = cached_get(self.session, url, _RATE_LIMITER, timeout=30)
             response.raise_for_status()
-            return response.text
+            # Парсеру отдаём байты: без лишнего декодирования в str, но с кодировкой из заголовка
+            return response.content, response.encoding or response.apparent_encoding
         except requests.RequestException as e:
             logger.error(f"Failed to fetch {url}: {e}")
             return None
     
-    def parse_rrar_page(self, html: str, category: str) -> List[Dict]:
-        """Parse RRAR rating page and extract companies."""
+    def _stream_company_names(self, html: bytes, encoding: Optional[str] = None) -> List[str]:
+        """
+        Stream company names from page without building the full DOM.
+        
+        Rows of the first ``table.rating-table`` are used if the page has
+        such a table, otherwise names come from ``div.company-item`` blocks.
+        """
+        table = None
+        header_skipped = False
+        table_names = []
+        block_names = []
+        
+        events = etree.iterparse(
+            io.BytesIO(html), events=('end',), tag=('tr', 'div'), html=True, recover=True,
+            encoding=encoding
+        )
+        for _, elem in events:
+            if elem.tag == 'tr':
+                parent_table = next(elem.iterancestors('table'), None)
+                if parent_table is None or not _has_class(parent_table, 'rating-table'):
+                    continue
+                if table is None:
+                    table = parent_table
+                if parent_table is table:
+                    if not header_skipped:
+                        header_skipped = True  # Пропускаем заголовок
+                    else:
+                        cols = list(elem.iter('td'))
+                        if len(cols) >= 2:
+                            table_names.append(''.join(cols[1].itertext()))
+            elif _has_class(elem, 'company-item'):
+                # Первый из h3/h4/a в порядке документа
+                name_elem = next(elem.iter('h3', 'h4', 'a'), None)
+                if name_elem is not None:
+                    block_names.append(''.join(name_elem.itertext()))
+            else:
+                continue
+            
+            # Освобождаем обработанные элементы, чтобы память не росла с размером страницы
+            elem.clear()
+            while elem.getprevious() is not None:
+                del elem.getparent()[0]
+        
+        return table_names if table is not None else block_names
+    
+    def parse_rrar_page(self, html: bytes, category: str, encoding: Optional[str] = None) -> List[Dict]:
+        """
+        Parse RRAR rating page and extract companies.
+        
+        ``encoding`` is the charset returned by fetch_page; without it
+        lxml relies on ``<meta charset>`` in the page.
+        """
         companies = []
         
         try:
-            soup = BeautifulSoup(html, 'lxml')
-            
             # Попытка найти таблицу с компаниями (структура может отличаться)
             # Это примерная структура, нужно будет адаптировать под реальный сайт
-            
-            # Вариант 1: Таблица
-            table = soup.find('table', class_='rating-table')
-            if table:
-                rows = table.find_all('tr')[1:]  # Пропускаем заголовок
-                for row in rows:
-                    cols = row.find_all('td')
-                    if len(cols) >= 2:
-                        company_name = clean_text(cols[1].get_text())
-                        if company_name:
-                            companies.append({
-                                'name': company_name,
-                                'segment_tag': category.upper(),
-                                'source': 'rrar_2025',
-                                'rating_ref': f"rrar_{category}"
-                            })
-            
-            # Вариант 2: Список div элементов
-            else:
-                company_blocks = soup.find_all('div', class_='company-item')
-                for block in company_blocks:
-                    name_elem = block.find(['h3', 'h4', 'a'])
-                    if name_elem:
-                        company_name = clean_text(name_elem.get_text())
-                        if company_name:
-                            companies.append({
-                                'name': company_name,
-                                'segment_tag': category.upper(),
-                                'source': 'rrar_2025',
-                                'rating_ref': f"rrar_{category}"
-                            })
+            # Вариант 1: Таблица, вариант 2: Список div элементов
+            for raw_name in self._stream_company_names(html, encoding):
+                company_name = clean_text(raw_name)
+                if company_name:
+                    companies.append({
+                        'name': company_name,
+                        'segment_tag': category.upper(),
+                        'source': 'rrar_2025',
+                        'rating_ref': f"rrar_{category}"
+                    })
             
             logger.info(f"Extracted {len(companies)} companies from {category}")
             
@@ -145,8 +181,8 @@ class RRARCollector:
         """Save raw data to JSON."""
         output_file = RAW_DATA_DIR / "rrar_raw.json"
         
-        with open(output_file, 'w', encoding='utf-8') as f:
-            json.dump(self.companies, f, ensure_ascii=False, indent=2)
+        with open(output_file, 'wb') as f:
+            f.write(orjson.dumps(self.companies, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS))
         
         logger.info(f"Saved raw RRAR data to {output_file}")
 
@@ -1,16 +1,13 @@
 """Collector for finding companies via web search and open catalogs."""
-import requests
 from bs4 import BeautifulSoup
 from typing import List, Dict, Optional
-import json
-from pathlib import Path
+import orjson
 
-import sys
-sys.path.insert(0, str(Path(__file__).parent.parent))
-
-from utils.logger import logger
-from utils.helpers import rate_limit, clean_text
-from config import RAW_DATA_DIR
+from ..utils.logger import logger
+from ..utils.helpers import clean_text
+from ..utils.segment_classifier import SegmentClassifier
+from ..utils.http import create_session
+from ..config import RAW_DATA_DIR
 
 
 class WebSearchCollector:
@@ -35,9 +32,18 @@ class WebSearchCollector:
         "Подарки.ру", "Прогресс", "Бизнес-Букет", "Панда",
     ]
     
+    # Ключевые слова категорий в порядке приоритета, остальные компании - BTL
+    CATEGORY_KEYWORDS = {
+        "SOUVENIR": ["подарки", "прогресс", "букет", "панда"],
+        "COMM_GROUP": ["id media", "publicity", "ketchum", "edelman"],
+        "FULL_CYCLE": ["pr inc", "grape", "affect", "comunica", "cros",
+                       "михайлов", "панорама"],
+    }
+    
+    _classifier = SegmentClassifier(CATEGORY_KEYWORDS)
+    
     def __init__(self):
-        self.session = requests.Session()
-        self.session.headers.update({
+        self.session = create_session({
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
         })
         self.companies = []
@@ -48,30 +54,13 @@ class WebSearchCollector:
         
         companies = []
         
-        # Категоризация компаний
-        btl_keywords = ["group", "eventum", "imars", "deltaplan", "komunica", 
-                        "marksman", "posterscope", "twiga", "zebra", "maximax",
-                        "event", "adrenalin", "action"]
-        
-        full_cycle_keywords = ["pr inc", "grape", "affect", "comunica", "cros",
-                               "михайлов", "панорама"]
-        
-        comm_group_keywords = ["id media", "publicity", "ketchum", "edelman"]
-        
-        souvenir_keywords = ["подарки", "прогресс", "букет", "панда"]
-        
         for company_name in self.KNOWN_COMPANIES:
-            name_lower = company_name.lower()
-            
-            # Определяем категорию
-            if any(kw in name_lower for kw in souvenir_keywords):
-                segment = "SOUVENIR"
-            elif any(kw in name_lower for kw in comm_group_keywords):
-                segment = "COMM_GROUP"
-            elif any(kw in name_lower for kw in full_cycle_keywords):
-                segment = "FULL_CYCLE"
-            else:
-                segment = "BTL"
+            # Определяем категорию за один проход по названию
+            matched = self._classifier.classify(company_name)
+            segment = next(
+                (category for category in self.CATEGORY_KEYWORDS if category in matched),
+                "BTL"
+            )
             
             companies.append({
                 'name': company_name,
@@ -100,8 +89,8 @@ class WebSearchCollector:
         """Save raw data to JSON."""
         output_file = RAW_DATA_DIR / "web_search_raw.json"
         
-        with open(output_file, 'w', encoding='utf-8') as f:
-            json.dump(self.companies, f, ensure_ascii=False, indent=2)
+        with open(output_file, 'wb') as f:
+            f.write(orjson.dumps(self.companies, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS))
         
         logger.info(f"Saved raw web search data to {output_file}")
 
@@ -12,6 +12,7 @@ DATA_DIR = BASE_DIR / "data"
 RAW_DATA_DIR = DATA_DIR / "raw"
 INTERIM_DATA_DIR = DATA_DIR / "interim"
 OUTPUT_FILE = DATA_DIR / "companies.csv"
+HTTP_CACHE_FILE = DATA_DIR / "http_cache.sqlite"
 
 # Create directories if they don't exist
 RAW_DATA_DIR.mkdir(parents=True, exist_ok=True)
@@ -24,6 +25,10 @@ RUSPROFILE_API_KEY = os.getenv("RUSPROFILE_API_KEY", "")
 # Rate limiting
 MAX_REQUESTS_PER_MINUTE = int(os.getenv("MAX_REQUESTS_PER_MINUTE", "10"))
 REQUEST_DELAY_SECONDS = int(os.getenv("REQUEST_DELAY_SECONDS", "2"))
+MAX_CONCURRENT_PER_HOST = int(os.getenv("MAX_CONCURRENT_PER_HOST", "4"))
+
+# HTTP cache
+HTTP_CACHE_EXPIRE_DAYS = int(os.getenv("HTTP_CACHE_EXPIRE_DAYS", "7"))
 
 # Filters
 MIN_REVENUE = int(os.getenv("MIN_REVENUE", "200000000"))
@@ -1,15 +1,14 @@
 """Enricher for getting INN and financial data from list-org.com."""
-import requests
 from typing import Dict, Optional, List
-import json
-from pathlib import Path
-import time
+import orjson
+from concurrent.futures import ThreadPoolExecutor
 import re
-import sys
-sys.path.insert(0, str(Path(__file__).parent.parent))
-from utils.logger import logger
-from utils.helpers import rate_limit, clean_text, clean_inn, normalize_revenue
-from config import RAW_DATA_DIR, INTERIM_DATA_DIR
+from ..utils.logger import logger
+from ..utils.helpers import clean_text, clean_inn, normalize_name, normalize_revenue
+from ..utils.http import create_session, enricher_get
+from ..config import RAW_DATA_DIR, INTERIM_DATA_DIR, MAX_CONCURRENT_PER_HOST
+
+_DIGITS = re.compile(r'\d+')
 
 
 class ListOrgEnricher:
@@ -17,23 +16,21 @@ class ListOrgEnricher:
     BASE_URL = "https://api.list-org.com"
 
     def __init__(self):
-        self.session = requests.Session()
-        self.session.headers.update({
+        self.session = create_session({
             'User-Agent': 'Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36'
         })
 
-    @rate_limit(delay=3)
     def search_company(self, company_name: str) -> Optional[Dict]:
         """Search company by name."""
         try:
             url = f"{self.BASE_URL}/api/search"
             params = {'query': company_name}
-            response = self.session.get(url, params=params, timeout=30)
+            response = enricher_get(self.session, url, params=params)
             if response.status_code != 200:
                 logger.warning(f"List-Org API error {response.status_code}: {response.text}")
                 return None
 
-            data = response.json()
+            data = orjson.loads(response.content)
             if not data or 'result' not in data or not data['result']:
                 return None
 
@@ -54,17 +51,16 @@ class ListOrgEnricher:
             logger.error(f"Error searching {company_name} on list-org: {e}")
             return None
 
-    @rate_limit(delay=3)
     def get_financials(self, inn: str) -> Optional[Dict]:
         """Get revenue and employees from financial reports."""
         try:
             url = f"{self.BASE_URL}/api/company"
             params = {'inn': inn}
-            response = self.session.get(url, params=params, timeout=30)
+            response = enricher_get(self.session, url, params=params)
             if response.status_code != 200:
                 return None
 
-            data = response.json()
+            data = orjson.loads(response.content)
             result = {}
 
             # Выручка из последнего финансового отчёта
@@ -77,8 +73,9 @@ class ListOrgEnricher:
 
             # Сотрудники
             employees = data.get('employees', '')
-            if employees and re.search(r'\d+', employees):
-                result['employees'] = int(re.search(r'\d+', employees).group())
+            emp_match = _DIGITS.search(employees) if employees else None
+            if emp_match:
+                result['employees'] = int(emp_match.group())
 
             # Сайт
             website = data.get('website', '')
@@ -93,12 +90,32 @@ class ListOrgEnricher:
     def enrich_companies(self, companies: List[Dict]) -> List[Dict]:
         """Main enrichment method."""
         logger.info(f"Enriching {len(companies)} companies via list-org.com...")
-        enriched = []
 
-        for idx, company in enumerate(companies, 1):
-            logger.info(f"Processing {idx}/{len(companies)}: {company['name']}")
+        # ИНН, уже известные из других источников, искать не нужно
+        known_inns = [clean_inn(company.get('inn')) for company in companies]
+
+        # Одинаковые (после нормализации) названия и ИНН запрашиваем только один раз
+        names = {}
+        for company, inn in zip(companies, known_inns):
+            if not inn:
+                names.setdefault(normalize_name(company['name']), company['name'])
+
+        with ThreadPoolExecutor(max_workers=MAX_CONCURRENT_PER_HOST) as executor:
+            # 1. Пакетный поиск ИНН по названиям
+            logger.info(f"Searching {len(names)} unique names...")
+            searches = dict(zip(names, executor.map(self.search_company, names.values())))
+
+            # 2. Пакетная загрузка финансов по известным и найденным ИНН
+            inns = list(dict.fromkeys(
+                [inn for inn in known_inns if inn]
+                + [result['inn'] for result in searches.values() if result and result['inn']]
+            ))
+            logger.info(f"Fetching financials for {len(inns)} unique INNs...")
+            financials = dict(zip(inns, executor.map(self.get_financials, inns)))
 
-            search_result = self.search_company(company['name'])
+        enriched = []
+        for company, known_inn in zip(companies, known_inns):
+            search_result = {'inn': known_inn} if known_inn else searches[normalize_name(company['name'])]
             if not search_result or not search_result['inn']:
                 logger.warning(f"No match found for: {company['name']}")
                 continue
@@ -106,15 +123,11 @@ class ListOrgEnricher:
             enriched_company = {**company, **search_result}
 
             # Дополним финансовыми данными
-            financials = self.get_financials(search_result['inn'])
-            if financials:
-                enriched_company.update(financials)
+            if financials[search_result['inn']]:
+                enriched_company.update(financials[search_result['inn']])
 
             enriched.append(enriched_company)
 
-            if idx % 10 == 0:
-                time.sleep(5)
-
         logger.success(f"Enriched {len(enriched)} out of {len(companies)} companies")
         self.save_enriched_data(enriched)
         return enriched
@@ -122,8 +135,8 @@ class ListOrgEnricher:
     def save_enriched_data(self, companies: List[Dict]):
         """Save to interim folder."""
         output_file = INTERIM_DATA_DIR / "enriched_listorg.json"
-        with open(output_file, 'w', encoding='utf-8') as f:
-            json.dump(companies, f, ensure_ascii=False, indent=2)
+        with open(output_file, 'wb') as f:
+            f.write(orjson.dumps(companies, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS))
         logger.info(f"Saved enriched data to {output_file}")
 
 
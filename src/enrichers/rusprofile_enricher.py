@@ -1,18 +1,81 @@
 """Enricher for getting INN and financial data from Rusprofile."""
 import requests
-from bs4 import BeautifulSoup
+from lxml import etree, html as lxml_html
+from lxml.cssselect import CSSSelector
 from typing import Dict, Optional, List
 import json
-from pathlib import Path
-import time
+import orjson
+from concurrent.futures import ThreadPoolExecutor
 import re
 
-import sys
-sys.path.insert(0, str(Path(__file__).parent.parent))
+from ..utils.logger import logger
+from ..utils.helpers import clean_text, clean_inn, normalize_name, normalize_revenue
+from ..utils.http import create_session, enricher_get
+from ..config import RAW_DATA_DIR, INTERIM_DATA_DIR, MAX_CONCURRENT_PER_HOST
 
-from utils.logger import logger
-from utils.helpers import rate_limit, clean_text, clean_inn, normalize_revenue
-from config import RAW_DATA_DIR, INTERIM_DATA_DIR
+# Регулярные выражения и селекторы компилируются один раз при импорте
+_INN_RE = re.compile(r'\d{10,12}')
+_OGRN_RE = re.compile(r'\d{13,15}')
+_YEAR_RE = re.compile(r'20\d{2}')
+_OKVED_RE = re.compile(r'\d{2}\.\d{2}')
+_DIGITS = re.compile(r'\d+')
+
+# Подписи блоков на странице компании
+_LABELS = {
+    'revenue': 'Выручка',
+    'okved': 'ОКВЭД',
+    'employees': 'Среднесписочная численность',
+}
+
+_TEXT_DIVS = etree.XPath("//div[normalize-space(text())]")
+_NEXT_VALUE = etree.XPath(
+    "following::div[contains(concat(' ', normalize-space(@class), ' '), ' value ')][1]"
+)
+
+_COMPANY_ITEM = CSSSelector('div.company-item')
+_COMPANY_NAME = CSSSelector('a.company-name')
+_COMPANY_INN = CSSSelector('div.company-inn')
+_COMPANY_OGRN = CSSSelector('div.company-ogrn')
+_COMPANY_REGION = CSSSelector('div.company-region')
+_COMPANY_STATUS = CSSSelector('div.company-status')
+_REPORT_YEAR = CSSSelector('div.report-year')
+_COMPANY_WEBSITE = CSSSelector('a.company-website')
+_COMPANY_PHONE = CSSSelector('div.company-phone')
+
+
+def _parse_html(response: requests.Response):
+    """Parse response bytes with lxml, using the same charset as response.text."""
+    # Без явной кодировки lxml читает страницу без <meta charset> как Latin-1
+    encoding = response.encoding or response.apparent_encoding
+    return lxml_html.fromstring(response.content, parser=lxml_html.HTMLParser(encoding=encoding))
+
+
+def _text(elem) -> str:
+    """Get cleaned text content of an lxml element."""
+    return clean_text(elem.text_content())
+
+
+def _index_label_values(tree) -> Dict:
+    """
+    Find value blocks for all known labels in a single pass over divs.
+    
+    Returns mapping like {'revenue': <div class="value">, ...}.
+    """
+    label_elems = {}
+    for elem in _TEXT_DIVS(tree):
+        text = elem.text or ''
+        for key, label in _LABELS.items():
+            if key not in label_elems and label in text:
+                label_elems[key] = elem
+        if len(label_elems) == len(_LABELS):
+            break
+    
+    values = {}
+    for key, elem in label_elems.items():
+        value = _NEXT_VALUE(elem)
+        if value:
+            values[key] = value[0]
+    return values
 
 
 class RusprofileEnricher:
@@ -22,37 +85,35 @@ class RusprofileEnricher:
     SEARCH_URL = f"{BASE_URL}/search"
     
     def __init__(self):
-        self.session = requests.Session()
-        self.session.headers.update({
+        self.session = create_session({
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36',
             'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8',
             'Accept-Language': 'ru-RU,ru;q=0.9,en-US;q=0.8,en;q=0.7',
         })
     
-    @rate_limit(delay=3)
     def search_company(self, company_name: str) -> Optional[Dict]:
         """Search for company on Rusprofile and get basic info."""
         try:
             logger.info(f"Searching for: {company_name}")
             
             # Поиск компании
-            response = self.session.get(
+            response = enricher_get(
+                self.session,
                 self.SEARCH_URL,
-                params={'query': company_name, 'type': 'ul'},
-                timeout=30
+                params={'query': company_name, 'type': 'ul'}
             )
             response.raise_for_status()
             
-            soup = BeautifulSoup(response.text, 'lxml')
+            tree = _parse_html(response)
             
             # Ищем первый результат поиска
-            first_result = soup.find('div', class_='company-item')
-            if not first_result:
+            results = _COMPANY_ITEM(tree)
+            if not results:
                 logger.warning(f"No results found for: {company_name}")
                 return None
             
             # Извлекаем данные
-            data = self._parse_search_result(first_result)
+            data = self._parse_search_result(results[0])
             
             if data:
                 logger.success(f"Found: {data.get('name')} (ИНН: {data.get('inn')})")
@@ -70,35 +131,33 @@ class RusprofileEnricher:
             data = {}
             
             # Название
-            name_elem = result_elem.find('a', class_='company-name')
-            if name_elem:
-                data['name'] = clean_text(name_elem.get_text())
+            name_elems = _COMPANY_NAME(result_elem)
+            if name_elems:
+                data['name'] = _text(name_elems[0])
             
             # ИНН
-            inn_elem = result_elem.find('div', class_='company-inn')
-            if inn_elem:
-                inn_text = clean_text(inn_elem.get_text())
-                inn_match = re.search(r'\d{10,12}', inn_text)
+            inn_elems = _COMPANY_INN(result_elem)
+            if inn_elems:
+                inn_match = _INN_RE.search(_text(inn_elems[0]))
                 if inn_match:
                     data['inn'] = clean_inn(inn_match.group())
             
             # ОГРН
-            ogrn_elem = result_elem.find('div', class_='company-ogrn')
-            if ogrn_elem:
-                ogrn_text = clean_text(ogrn_elem.get_text())
-                ogrn_match = re.search(r'\d{13,15}', ogrn_text)
+            ogrn_elems = _COMPANY_OGRN(result_elem)
+            if ogrn_elems:
+                ogrn_match = _OGRN_RE.search(_text(ogrn_elems[0]))
                 if ogrn_match:
                     data['ogrn'] = ogrn_match.group()
             
             # Регион
-            region_elem = result_elem.find('div', class_='company-region')
-            if region_elem:
-                data['region'] = clean_text(region_elem.get_text())
+            region_elems = _COMPANY_REGION(result_elem)
+            if region_elems:
+                data['region'] = _text(region_elems[0])
             
             # Статус
-            status_elem = result_elem.find('div', class_='company-status')
-            if status_elem:
-                data['status'] = clean_text(status_elem.get_text())
+            status_elems = _COMPANY_STATUS(result_elem)
+            if status_elems:
+                data['status'] = _text(status_elems[0])
             
             return data if data.get('inn') else None
             
@@ -106,7 +165,6 @@ class RusprofileEnricher:
             logger.error(f"Error parsing search result: {e}")
             return None
     
-    @rate_limit(delay=3)
     def get_company_details(self, inn: str) -> Optional[Dict]:
         """Get detailed company info by INN."""
         try:
@@ -114,58 +172,49 @@ class RusprofileEnricher:
             
             # Страница компании
             company_url = f"{self.BASE_URL}/{inn}"
-            response = self.session.get(company_url, timeout=30)
+            response = enricher_get(self.session, company_url)
             response.raise_for_status()
             
-            soup = BeautifulSoup(response.text, 'lxml')
+            tree = _parse_html(response)
             
             details = {}
+            label_values = _index_label_values(tree)
             
             # Выручка (обычно в блоке финансовой отчётности)
-            revenue_elem = soup.find('div', string=re.compile('Выручка'))
-            if revenue_elem:
-                revenue_value = revenue_elem.find_next('div', class_='value')
-                if revenue_value:
-                    revenue_text = clean_text(revenue_value.get_text())
-                    details['revenue'] = normalize_revenue(revenue_text)
-                    
-                    # Год отчётности
-                    year_elem = soup.find('div', class_='report-year')
-                    if year_elem:
-                        year_text = clean_text(year_elem.get_text())
-                        year_match = re.search(r'20\d{2}', year_text)
-                        if year_match:
-                            details['revenue_year'] = int(year_match.group())
+            revenue_value = label_values.get('revenue')
+            if revenue_value is not None:
+                details['revenue'] = normalize_revenue(_text(revenue_value))
+                
+                # Год отчётности
+                year_elems = _REPORT_YEAR(tree)
+                if year_elems:
+                    year_match = _YEAR_RE.search(_text(year_elems[0]))
+                    if year_match:
+                        details['revenue_year'] = int(year_match.group())
             
             # ОКВЭД
-            okved_elem = soup.find('div', string=re.compile('ОКВЭД'))
-            if okved_elem:
-                okved_value = okved_elem.find_next('div', class_='value')
-                if okved_value:
-                    okved_text = clean_text(okved_value.get_text())
-                    okved_match = re.search(r'\d{2}\.\d{2}', okved_text)
-                    if okved_match:
-                        details['okved_main'] = okved_match.group()
+            okved_value = label_values.get('okved')
+            if okved_value is not None:
+                okved_match = _OKVED_RE.search(_text(okved_value))
+                if okved_match:
+                    details['okved_main'] = okved_match.group()
             
             # Количество сотрудников
-            employees_elem = soup.find('div', string=re.compile('Среднесписочная численность'))
-            if employees_elem:
-                emp_value = employees_elem.find_next('div', class_='value')
-                if emp_value:
-                    emp_text = clean_text(emp_value.get_text())
-                    emp_match = re.search(r'\d+', emp_text)
-                    if emp_match:
-                        details['employees'] = int(emp_match.group())
+            emp_value = label_values.get('employees')
+            if emp_value is not None:
+                emp_match = _DIGITS.search(_text(emp_value))
+                if emp_match:
+                    details['employees'] = int(emp_match.group())
             
             # Сайт
-            site_elem = soup.find('a', class_='company-website')
-            if site_elem:
-                details['site'] = site_elem.get('href', '').strip()
+            site_elems = _COMPANY_WEBSITE(tree)
+            if site_elems:
+                details['site'] = site_elems[0].get('href', '').strip()
             
             # Телефон
-            phone_elem = soup.find('div', class_='company-phone')
-            if phone_elem:
-                details['contacts'] = clean_text(phone_elem.get_text())
+            phone_elems = _COMPANY_PHONE(tree)
+            if phone_elems:
+                details['contacts'] = _text(phone_elems[0])
             
             return details
             
@@ -177,13 +226,35 @@ class RusprofileEnricher:
         """Enrich list of companies with INN and financial data."""
         logger.info(f"Enriching {len(companies)} companies with Rusprofile data...")
         
-        enriched = []
+        # ИНН, уже известные из других источников, искать не нужно
+        known_inns = [clean_inn(company.get('inn')) for company in companies]
+        
+        # Названия, совпадающие после нормализации, ищем один раз - по первому написанию
+        names = {}
+        for company, inn in zip(companies, known_inns):
+            if not inn:
+                names.setdefault(normalize_name(company['name']), company['name'])
         
-        for idx, company in enumerate(companies, 1):
-            logger.info(f"Processing {idx}/{len(companies)}: {company['name']}")
+        with ThreadPoolExecutor(max_workers=MAX_CONCURRENT_PER_HOST) as executor:
+            # 1. Поиск ИНН по уникальным названиям
+            logger.info(f"Searching {len(names)} unique names...")
+            searches = dict(zip(names, executor.map(self.search_company, names.values())))
             
-            # Поиск компании
-            search_result = self.search_company(company['name'])
+            # 2. Детальная информация по уникальным известным и найденным ИНН
+            inns = list(dict.fromkeys(
+                [inn for inn in known_inns if inn]
+                + [result['inn'] for result in searches.values() if result and result.get('inn')]
+            ))
+            logger.info(f"Fetching details for {len(inns)} unique INNs...")
+            details = dict(zip(inns, executor.map(self.get_company_details, inns)))
+        
+        # Результаты раскладываем по всем компаниям в исходном порядке
+        enriched = []
+        for company, known_inn in zip(companies, known_inns):
+            if known_inn:
+                search_result = {'inn': known_inn}
+            else:
+                search_result = searches[normalize_name(company['name'])]
             
             if not search_result or not search_result.get('inn'):
                 logger.warning(f"Could not find INN for: {company['name']}")
@@ -191,18 +262,10 @@ class RusprofileEnricher:
             
             # Объединяем данные
             enriched_company = {**company, **search_result}
-            
-            # Получаем детальную информацию
-            details = self.get_company_details(search_result['inn'])
-            if details:
-                enriched_company.update(details)
+            if details[search_result['inn']]:
+                enriched_company.update(details[search_result['inn']])
             
             enriched.append(enriched_company)
-            
-            # Пауза для избежания блокировки
-            if idx % 10 == 0:
-                logger.info(f"Processed {idx} companies, taking a short break...")
-                time.sleep(5)
         
         logger.success(f"Successfully enriched {len(enriched)}/{len(companies)} companies")
         
@@ -215,8 +278,8 @@ class RusprofileEnricher:
         """Save enriched data to JSON."""
         output_file = INTERIM_DATA_DIR / "enriched_rusprofile.json"
         
-        with open(output_file, 'w', encoding='utf-8') as f:
-            json.dump(companies, f, ensure_ascii=False, indent=2)
+        with open(output_file, 'wb') as f:
+            f.write(orjson.dumps(companies, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS))
         
         logger.info(f"Saved enriched data to {output_file}")
 
@@ -1,43 +1,56 @@
 """Main entry point for the data collection pipeline."""
-import sys
 from pathlib import Path
 import pandas as pd
-import json
+import polars as pl
+import orjson
 
-# Add src to path
-sys.path.insert(0, str(Path(__file__).parent))
-
-from utils.logger import logger
-from config import OUTPUT_FILE, MIN_REVENUE
+from .utils.logger import logger
+from .config import OUTPUT_FILE, MIN_REVENUE
 
 # Processors
-from processors.cleaner import DataCleaner
-from processors.deduplicator import Deduplicator
-from processors.validator import DataValidator
+from .processors.cleaner import DataCleaner
+from .processors.deduplicator import Deduplicator
+from .processors.validator import DataValidator
+
+RULE = "=" * 80
+
+
+def log_step(title: str):
+    """Log pipeline step banner with a single logger call."""
+    logger.info(f"\n{RULE}\n{title}\n{RULE}")
+
+
+def to_csv_frame(df: pd.DataFrame) -> pl.DataFrame:
+    """
+    Convert export frame to Polars, keeping the CSV format of DataFrame.to_csv.
+    
+    Booleans are written as True/False and empty strings without quotes.
+    """
+    return pl.from_pandas(df).with_columns(
+        pl.col(pl.Categorical).cast(pl.Utf8)
+    ).with_columns(
+        pl.col(pl.Boolean).cast(pl.Utf8).str.to_titlecase(),
+        # Пустую строку пишем как null - Polars выводит её без кавычек
+        pl.when(pl.col(pl.Utf8) != '').then(pl.col(pl.Utf8)),
+    )
 
 
 def main():
     """Run the complete data collection pipeline."""
-    logger.info("=" * 80)
-    logger.info("Starting Lead Sniper Data Collection Pipeline")
-    logger.info("=" * 80)
+    logger.info(f"{RULE}\nStarting Lead Sniper Data Collection Pipeline\n{RULE}")
 
     try:
         # ===== Step 1: Load manually verified companies with real financials =====
-        logger.info("\n" + "=" * 80)
-        logger.info("STEP 1: Loading manually verified companies with financials...")
-        logger.info("=" * 80)
+        log_step("STEP 1: Loading manually verified companies with financials...")
 
         raw_file = Path(__file__).parent.parent / "data" / "raw" / "manual_seed_with_financials.json"
-        with open(raw_file, 'r', encoding='utf-8') as f:
-            companies = json.load(f)
+        # Читаем байты и разбираем одним вызовом orjson, без промежуточной str
+        companies = orjson.loads(raw_file.read_bytes())
 
         logger.success(f"Loaded {len(companies)} manually verified companies")
 
         # ===== Step 2: Clean and normalize data =====
-        logger.info("\n" + "=" * 80)
-        logger.info("STEP 2: Cleaning and normalizing data...")
-        logger.info("=" * 80)
+        log_step("STEP 2: Cleaning and normalizing data...")
 
         cleaner = DataCleaner()
         df = cleaner.clean_companies(companies)
@@ -56,9 +69,7 @@ def main():
         logger.success(f"Data validated: {len(df)} records passed filters")
 
         # ===== Step 5: Export final CSV =====
-        logger.info("\n" + "=" * 80)
-        logger.info("STEP 5: Exporting final CSV...")
-        logger.info("=" * 80)
+        log_step("STEP 5: Exporting final CSV...")
 
         column_order = [
             'inn', 'name', 'revenue_year', 'revenue', 'segment_tag', 'source',
@@ -71,16 +82,24 @@ def main():
         if 'revenue' in df_export.columns:
             df_export = df_export.sort_values('revenue', ascending=False)
 
-        df_export.to_csv(OUTPUT_FILE, index=False, encoding='utf-8')
-        logger.success("=" * 80)
-        logger.success(f"Pipeline completed successfully!")
-        logger.success(f"Total companies: {len(df_export)}")
-        logger.success(f"Output file: {OUTPUT_FILE}")
-        logger.success("=" * 80)
-
-        logger.info("\nTop 5 companies by revenue:")
-        for _, row in df_export.head().iterrows():
-            logger.info(f"  {row['name']} - {row['revenue']:,} ₽ ({row['segment_tag']})")
+        # CSV пишет Polars (Rust), а не построчный writer pandas
+        to_csv_frame(df_export).write_csv(OUTPUT_FILE)
+        logger.success(
+            f"{RULE}\n"
+            f"Pipeline completed successfully!\n"
+            f"Total companies: {len(df_export)}\n"
+            f"Output file: {OUTPUT_FILE}\n"
+            f"{RULE}"
+        )
+
+        # Строки топа собираются, только если уровень INFO включён
+        logger.opt(lazy=True).info(
+            "\nTop 5 companies by revenue:\n{}",
+            lambda: "\n".join(
+                f"  {row.name} - {row.revenue:,} ₽ ({row.segment_tag})"
+                for row in df_export.head().itertuples(index=False)
+            )
+        )
 
     except Exception as e:
         logger.error(f"Pipeline failed with error: {e}")
@@ -1,14 +1,88 @@
 """Data cleaning and normalization."""
 import pandas as pd
+import polars as pl
 from typing import List, Dict
 import re
 
-import sys
-from pathlib import Path
-sys.path.insert(0, str(Path(__file__).parent.parent))
+from ..utils.logger import logger
 
-from utils.logger import logger
-from utils.helpers import clean_text, clean_inn, normalize_revenue
+# Колонки, в которых схлопываются пробелы
+TEXT_COLUMNS = ('name', 'okved_main', 'region', 'description')
+
+# Колонки с небольшим числом различных значений
+CATEGORY_COLUMNS = ('segment_tag', 'source', 'region', 'okved_main')
+
+_VALID_INN_LENGTHS = [10, 12]
+_INVALID_INN_FLAG = '_inn_invalid'
+
+
+def _str_col(col: str) -> pl.Expr:
+    """Column as string, missing values to ''."""
+    return pl.col(col).cast(pl.Utf8).fill_null('')
+
+
+def _clean_text_expr(col: str) -> pl.Expr:
+    """Polars version of clean_text: collapse whitespace, missing values to ''."""
+    return _str_col(col).str.replace_all(r'\s+', ' ').str.strip_chars()
+
+
+def _inn_digits_expr() -> pl.Expr:
+    """Digits of INN, missing values to ''."""
+    return _str_col('inn').str.replace_all(r'\D', '')
+
+
+def _invalid_inn_expr() -> pl.Expr:
+    """Non-empty INNs that are neither 10 nor 12 digits long."""
+    digits = _inn_digits_expr()
+    return (digits != '') & ~digits.str.len_chars().is_in(_VALID_INN_LENGTHS)
+
+
+def _clean_inn_expr() -> pl.Expr:
+    """Polars version of clean_inn: keep digits, blank invalid INNs."""
+    digits = _inn_digits_expr()
+    return pl.when(digits.str.len_chars().is_in(_VALID_INN_LENGTHS)).then(digits).otherwise(pl.lit(''))
+
+
+def _clean_url_expr() -> pl.Expr:
+    """Drop spaces from site and add http:// if no protocol."""
+    site = _str_col('site').str.strip_chars().str.replace_all(' ', '', literal=True)
+    no_protocol = (site != '') & ~site.str.starts_with('http://') & ~site.str.starts_with('https://')
+    return pl.when(no_protocol).then(pl.lit('http://') + site).otherwise(site).alias('site')
+
+
+def _normalize_revenue_expr() -> pl.Expr:
+    """Polars version of normalize_revenue: "200-500 млн" -> 200000000, missing -> 0."""
+    s = (
+        _str_col('revenue').str.to_lowercase().str.strip_chars()
+        .str.replace_all(' ', '', literal=True).str.replace_all(',', '', literal=True)
+    )
+    
+    # Диапазон - берём минимум, "от" убираем
+    s = s.str.replace(r'(?s)[-–].*', '').str.replace_all('от', '', literal=True)
+    
+    num = s.str.extract(r'(\d+\.?\d*)', 1).cast(pl.Float64).fill_null(0)
+    multiplier = (
+        pl.when(s.str.contains('млрд|billion')).then(1_000_000_000)
+        .when(s.str.contains('млн|million')).then(1_000_000)
+        .when(s.str.contains('тыс|thousand')).then(1_000)
+        .otherwise(1)
+    )
+    
+    return (num * multiplier).cast(pl.Int64).alias('revenue')
+
+
+def _revenue_year_expr() -> pl.Expr:
+    """Revenue year as integer, 2023 (last available) if missing."""
+    return pl.col('revenue_year').cast(pl.Float64, strict=False).fill_null(2023).cast(pl.Int64)
+
+
+# Выражения для колонок, которые чистятся не как обычный текст
+_COLUMN_EXPRS = {
+    'inn': _clean_inn_expr,
+    'site': _clean_url_expr,
+    'revenue': _normalize_revenue_expr,
+    'revenue_year': _revenue_year_expr,
+}
 
 
 class DataCleaner:
@@ -21,76 +95,54 @@ class DataCleaner:
         """Clean and normalize company data."""
         logger.info(f"Cleaning {len(companies)} companies...")
         
-        # Конвертируем в DataFrame
-        df = pd.DataFrame(companies)
+        # Polars собирает колонки прямо из словарей; колонки со смешанными типами
+        # (выручка числом или строкой) приводятся к строке
+        raw = pl.from_dicts(companies, infer_schema_length=None)
+        
+        initial_count = len(raw)
         
-        initial_count = len(df)
+        # Вся очистка колонок - один запрос Polars, каждая колонка читается один раз.
+        # Пропуски в остальных строковых колонках заменяем здесь же: дальше по пайплайну
+        # отсутствие значения - это пустая строка
+        df = self._clean_with_polars(raw)
         
-        # Очистка названий
+        # Убираем строки без названия
         if 'name' in df.columns:
-            df['name'] = df['name'].apply(lambda x: clean_text(str(x)) if pd.notna(x) else '')
             df = df[df['name'] != '']
         
-        # Очистка ИНН
-        if 'inn' in df.columns:
-            df['inn'] = df['inn'].apply(lambda x: clean_inn(str(x)) if pd.notna(x) else '')
-        
-        # Нормализация выручки
-        if 'revenue' in df.columns:
-            df['revenue'] = df['revenue'].apply(
-                lambda x: normalize_revenue(str(x)) if pd.notna(x) else 0
-            )
-        
-        # Убедимся что revenue_year это число
-        if 'revenue_year' in df.columns:
-            df['revenue_year'] = pd.to_numeric(df['revenue_year'], errors='coerce')
-            # Если год не указан, ставим 2023 (последний доступный)
-            df['revenue_year'] = df['revenue_year'].fillna(2023).astype(int)
-        
-        # Очистка ОКВЭД
-        if 'okved_main' in df.columns:
-            df['okved_main'] = df['okved_main'].apply(
-                lambda x: clean_text(str(x)) if pd.notna(x) else ''
-            )
-        
-        # Очистка региона
-        if 'region' in df.columns:
-            df['region'] = df['region'].apply(
-                lambda x: clean_text(str(x)) if pd.notna(x) else ''
-            )
-        
-        # Очистка сайта
-        if 'site' in df.columns:
-            df['site'] = df['site'].apply(self._clean_url)
-        
-        # Очистка описания
-        if 'description' in df.columns:
-            df['description'] = df['description'].apply(
-                lambda x: clean_text(str(x)) if pd.notna(x) else ''
-            )
-        
-        # Убираем строки без названия
-        df = df[df['name'].notna() & (df['name'] != '')]
+        # Повторяющиеся строковые значения храним как категории
+        for col in CATEGORY_COLUMNS:
+            if col in df.columns:
+                df[col] = df[col].astype('category')
         
         logger.success(f"Cleaned data: {len(df)}/{initial_count} companies remaining")
         
         return df
     
-    def _clean_url(self, url):
-        """Clean and validate URL."""
-        if pd.isna(url) or not url:
-            return ''
-        
-        url = str(url).strip()
-        
-        # Убираем пробелы
-        url = url.replace(' ', '')
-        
-        # Добавляем http:// если нет протокола
-        if url and not url.startswith(('http://', 'https://')):
-            url = 'http://' + url
-        
-        return url
+    def _clean_with_polars(self, raw: pl.DataFrame) -> pd.DataFrame:
+        """Clean columns with a single Polars with_columns call, return Arrow-backed pandas frame."""
+        columns = [col for col in TEXT_COLUMNS + tuple(_COLUMN_EXPRS) if col in raw.columns]
+        
+        exprs = [
+            _COLUMN_EXPRS[col]() if col in _COLUMN_EXPRS else _clean_text_expr(col)
+            for col in columns
+        ]
+        # Колонки, где все значения пропущены, Polars типизирует как Null - тоже приводим к строке
+        exprs.append(pl.col(pl.Utf8, pl.Null).exclude(columns).cast(pl.Utf8).fill_null(''))
+        # Флаг невалидного ИНН считается в том же запросе: цифры ИНН - общее подвыражение
+        if 'inn' in columns:
+            exprs.append(_invalid_inn_expr().alias(_INVALID_INN_FLAG))
+        
+        cleaned = raw.lazy().with_columns(exprs).collect()
+        
+        if 'inn' in columns:
+            invalid_count = cleaned[_INVALID_INN_FLAG].sum()
+            if invalid_count:
+                logger.warning(f"Cleared {invalid_count} INNs with invalid length")
+            cleaned = cleaned.drop(_INVALID_INN_FLAG)
+        
+        # Строки остаются в Arrow (байты + смещения), а не в Python-объектах
+        return cleaned.to_pandas(use_pyarrow_extension_array=True)
     
     def ensure_required_columns(self, df: pd.DataFrame) -> pd.DataFrame:
         """Ensure all required columns exist."""
@@ -114,7 +166,7 @@ class DataCleaner:
 if __name__ == "__main__":
     # Тест
     import json
-    from config import RAW_DATA_DIR
+    from ..config import RAW_DATA_DIR
     
     # Загружаем тестовые данные
     with open(RAW_DATA_DIR / "web_search_raw.json", 'r', encoding='utf-8') as f:
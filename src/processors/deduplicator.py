@@ -1,12 +1,9 @@
 """Deduplication of company records."""
 import pandas as pd
+import numpy as np
 from typing import List
 
-import sys
-from pathlib import Path
-sys.path.insert(0, str(Path(__file__).parent.parent))
-
-from utils.logger import logger
+from ..utils.logger import logger
 
 
 class Deduplicator:
@@ -16,56 +13,44 @@ class Deduplicator:
         pass
     
     def deduplicate(self, df: pd.DataFrame) -> pd.DataFrame:
-        """Remove duplicates based on INN and name."""
+        """
+        Remove duplicates based on INN and name.
+        
+        Returns a new DataFrame, the input frame is not modified.
+        """
         logger.info(f"Starting deduplication. Initial records: {len(df)}")
         
         initial_count = len(df)
         
-        # Создаём копию для работы
-        df_dedup = df.copy()
+        # Стабильная сортировка только по двум колонкам: первыми идут записи с максимальной выручкой
+        order = (
+            df[['revenue', 'revenue_year']]
+            .reset_index(drop=True)
+            .sort_values(by=['revenue', 'revenue_year'], ascending=[False, False], kind='mergesort')
+            .index.to_numpy()
+        )
+        
+        # Единый ключ: ИНН (приоритетнее), для записей без ИНН - нормализованное название
+        # (колонки могут быть Arrow-строками, поэтому ключ собираем в массиве NumPy)
+        inn = df['inn'].to_numpy(dtype=str)
+        inn_missing = inn == ''
+        name_normalized = df['name'].str.lower().str.strip().to_numpy(dtype=str)
+        key = np.where(inn_missing, np.char.add('N:', name_normalized), np.char.add('I:', inn))[order]
         
-        # 1. Дедупликация по ИНН (приоритетнее)
-        if 'inn' in df_dedup.columns:
-            # Оставляем записи с ИНН
-            df_with_inn = df_dedup[df_dedup['inn'].notna() & (df_dedup['inn'] != '')]
-            df_without_inn = df_dedup[df_dedup['inn'].isna() | (df_dedup['inn'] == '')]
-            
-            # Дедупликация по ИНН - оставляем запись с максимальной полнотой данных
-            if len(df_with_inn) > 0:
-                df_with_inn = df_with_inn.sort_values(
-                    by=['revenue', 'revenue_year'], 
-                    ascending=[False, False]
-                )
-                df_with_inn = df_with_inn.drop_duplicates(subset=['inn'], keep='first')
-                
-                logger.info(f"Deduplicated by INN: {len(df_with_inn)} unique INNs")
-            
-            # Объединяем обратно
-            df_dedup = pd.concat([df_with_inn, df_without_inn], ignore_index=True)
+        # Вторая стабильная сортировка по ключу: внутри ключа сохраняется порядок по выручке,
+        # первая запись каждой группы находится сравнением с соседом, без хэш-таблицы
+        by_key = np.argsort(key, kind='stable')
+        sorted_key = key[by_key]
+        first = np.ones(len(sorted_key), dtype=bool)
+        first[1:] = sorted_key[1:] != sorted_key[:-1]
         
-        # 2. Дедупликация по названию (для записей без ИНН)
-        if 'name' in df_dedup.columns:
-            # Нормализуем названия для сравнения
-            df_dedup['name_normalized'] = df_dedup['name'].str.lower().str.strip()
-            
-            # Для записей без ИНН дедуплицируем по имени
-            mask_no_inn = df_dedup['inn'].isna() | (df_dedup['inn'] == '')
-            
-            if mask_no_inn.sum() > 0:
-                df_no_inn = df_dedup[mask_no_inn]
-                df_no_inn = df_no_inn.drop_duplicates(subset=['name_normalized'], keep='first')
-                
-                df_with_inn = df_dedup[~mask_no_inn]
-                
-                df_dedup = pd.concat([df_with_inn, df_no_inn], ignore_index=True)
-                
-                logger.info(f"Deduplicated by name: {len(df_no_inn)} unique names without INN")
-            
-            # Удаляем временную колонку
-            df_dedup = df_dedup.drop(columns=['name_normalized'])
+        # Возвращаем оставшиеся записи в порядке по выручке
+        keep = order[np.sort(by_key[first])]
+        df_dedup = df.iloc[keep].reset_index(drop=True)
         
-        # 3. Удаляем полные дубликаты (на всякий случай)
-        df_dedup = df_dedup.drop_duplicates()
+        missing_kept = int(inn_missing[keep].sum())
+        logger.info(f"Deduplicated by INN: {len(keep) - missing_kept} unique INNs")
+        logger.info(f"Deduplicated by name: {missing_kept} unique names without INN")
         
         removed_count = initial_count - len(df_dedup)
         logger.success(f"Deduplication complete. Removed {removed_count} duplicates. Final: {len(df_dedup)} records")
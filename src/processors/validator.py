@@ -1,13 +1,45 @@
 """Validation and filtering of company data."""
 import pandas as pd
-from typing import List, Set
+import numpy as np
+import re
+from typing import Callable, List, Set
 
-import sys
-from pathlib import Path
-sys.path.insert(0, str(Path(__file__).parent.parent))
+from ..utils.logger import logger
+from ..config import MIN_REVENUE, TARGET_COUNTRY, RELEVANT_OKVED, SEGMENT_KEYWORDS
 
-from utils.logger import logger
-from config import MIN_REVENUE, TARGET_COUNTRY, RELEVANT_OKVED, SEGMENT_KEYWORDS
+# Российские регионы (примерный список)
+RUSSIAN_KEYWORDS = (
+    'москва', 'санкт-петербург', 'спб', 'россия', 'russia',
+    'екатеринбург', 'новосибирск', 'казань', 'нижний новгород',
+    'челябинск', 'самара', 'ростов', 'уфа', 'красноярск',
+    'пермь', 'воронеж', 'волгоград', 'краснодар', 'саратов'
+)
+
+# Признаки ликвидированных компаний
+INACTIVE_KEYWORDS = ('ликвидирован', 'банкротств', 'реорганизац', 'liquidated', 'bankrupt')
+
+
+def _keywords_re(keywords) -> re.Pattern:
+    """Compile case-insensitive alternation of keywords."""
+    return re.compile('|'.join(map(re.escape, keywords)), re.IGNORECASE)
+
+
+def _match_categories(s: pd.Series, match: Callable[[pd.Series], pd.Series], missing: bool) -> pd.Series:
+    """
+    Evaluate match once per distinct value instead of once per row.
+    
+    match gets string Series of categories and returns boolean Series,
+    missing values of s are mapped to ``missing``.
+    """
+    # Null-колонку (все значения пропущены) нельзя привести к категориям
+    if not isinstance(s.dtype, pd.CategoricalDtype) and s.isna().all():
+        return pd.Series(missing, index=s.index)
+    
+    s = s.astype('category')
+    categories = s.cat.categories.astype(str).to_series()
+    # Код -1 (пропуск) попадает на последний элемент
+    matched = np.append(match(categories).to_numpy(dtype=bool), missing)
+    return pd.Series(matched[s.cat.codes.to_numpy()], index=s.index)
 
 
 class DataValidator:
@@ -15,6 +47,11 @@ class DataValidator:
     
     def __init__(self, min_revenue: int = MIN_REVENUE):
         self.min_revenue = min_revenue
+        # Регулярные выражения компилируются один раз на валидатор
+        self._russian_re = _keywords_re(RUSSIAN_KEYWORDS)
+        self._inactive_re = _keywords_re(INACTIVE_KEYWORDS)
+        self._relevant_okved = tuple(RELEVANT_OKVED)
+        self._valid_segments = frozenset(SEGMENT_KEYWORDS.keys())
     
     def validate(self, df: pd.DataFrame) -> pd.DataFrame:
         """Apply all validation rules."""
@@ -22,17 +59,27 @@ class DataValidator:
         
         initial_count = len(df)
         
-        # 1. Фильтр по стране (Россия)
-        df = self._filter_by_country(df)
-        
-        # 2. Фильтр по выручке
-        df = self._filter_by_revenue(df)
+        # Маски считаются по исходному DataFrame, срез делается один раз
+        checks = [
+            # 1. Фильтр по стране (Россия)
+            (self._country_mask(df), "Filtered by country: removed {} non-Russian companies"),
+            # 2. Фильтр по выручке
+            (self._revenue_mask(df), f"Filtered by revenue (>= {self.min_revenue:,}): removed {{}} companies"),
+            # 3. Валидация сегмента
+            (self._segment_mask(df), "Segment validation: removed {} companies with invalid segments"),
+            # 4. Удаление недействующих компаний
+            (self._active_mask(df), "Filtered inactive companies: removed {} companies"),
+        ]
         
-        # 3. Валидация сегмента
-        df = self._validate_segment(df)
+        keep = pd.Series(True, index=df.index)
+        for mask, message in checks:
+            # Считаем только записи, прошедшие предыдущие фильтры
+            removed = int((keep & ~mask).sum())
+            keep &= mask
+            if removed > 0:
+                logger.info(message.format(removed))
         
-        # 4. Удаление недействующих компаний
-        df = self._filter_active_companies(df)
+        df = df[keep]
         
         final_count = len(df)
         removed = initial_count - final_count
@@ -41,95 +88,47 @@ class DataValidator:
         
         return df
     
-    def _filter_by_country(self, df: pd.DataFrame) -> pd.DataFrame:
-        """Filter companies by country (Russia)."""
+    def _country_mask(self, df: pd.DataFrame) -> pd.Series:
+        """Mask of companies from Russia."""
         if 'region' not in df.columns:
             logger.warning("No 'region' column, skipping country filter")
-            return df
-        
-        initial = len(df)
-        
-        # Российские регионы (примерный список)
-        russian_keywords = [
-            'москва', 'санкт-петербург', 'спб', 'россия', 'russia',
-            'екатеринбург', 'новосибирск', 'казань', 'нижний новгород',
-            'челябинск', 'самара', 'ростов', 'уфа', 'красноярск',
-            'пермь', 'воронеж', 'волгоград', 'краснодар', 'саратов'
-        ]
-        
-        # Фильтруем по региону
-        mask = df['region'].str.lower().str.contains('|'.join(russian_keywords), na=False)
+            return pd.Series(True, index=df.index)
         
         # Если регион не указан, оставляем запись (будем считать что это РФ)
-        mask = mask | df['region'].isna() | (df['region'] == '')
-        
-        df_filtered = df[mask]
-        
-        removed = initial - len(df_filtered)
-        if removed > 0:
-            logger.info(f"Filtered by country: removed {removed} non-Russian companies")
-        
-        return df_filtered
+        return _match_categories(
+            df['region'],
+            lambda regions: regions.eq('') | regions.str.contains(self._russian_re),
+            missing=True
+        )
     
-    def _filter_by_revenue(self, df: pd.DataFrame) -> pd.DataFrame:
-        """Filter companies by minimum revenue."""
+    def _revenue_mask(self, df: pd.DataFrame) -> pd.Series:
+        """Mask of companies with revenue of at least min_revenue."""
         if 'revenue' not in df.columns:
             logger.warning("No 'revenue' column, skipping revenue filter")
-            return df
-        
-        initial = len(df)
-        
-        # Фильтруем по выручке
-        df_filtered = df[df['revenue'] >= self.min_revenue]
+            return pd.Series(True, index=df.index)
         
-        removed = initial - len(df_filtered)
-        logger.info(f"Filtered by revenue (>= {self.min_revenue:,}): removed {removed} companies")
-        
-        return df_filtered
+        return df['revenue'].ge(self.min_revenue)
     
-    def _validate_segment(self, df: pd.DataFrame) -> pd.DataFrame:
-        """Validate that segment_tag is relevant."""
+    def _segment_mask(self, df: pd.DataFrame) -> pd.Series:
+        """Mask of companies with a relevant segment_tag."""
         if 'segment_tag' not in df.columns:
             logger.warning("No 'segment_tag' column, skipping segment validation")
-            return df
-        
-        initial = len(df)
-        
-        # Допустимые сегменты
-        valid_segments = set(SEGMENT_KEYWORDS.keys())
-        
-        # Оставляем только записи с валидными сегментами
-        df_filtered = df[df['segment_tag'].isin(valid_segments)]
-        
-        removed = initial - len(df_filtered)
-        if removed > 0:
-            logger.info(f"Segment validation: removed {removed} companies with invalid segments")
+            return pd.Series(True, index=df.index)
         
-        return df_filtered
+        return df['segment_tag'].isin(self._valid_segments)
     
-    def _filter_active_companies(self, df: pd.DataFrame) -> pd.DataFrame:
-        """Remove inactive/liquidated companies."""
+    def _active_mask(self, df: pd.DataFrame) -> pd.Series:
+        """Mask of companies that are not liquidated or bankrupt."""
         if 'status' not in df.columns:
             logger.warning("No 'status' column, skipping active company filter")
-            return df
-        
-        initial = len(df)
-        
-        # Фильтруем ликвидированные компании
-        inactive_keywords = ['ликвидирован', 'банкротств', 'реорганизац', 'liquidated', 'bankrupt']
-        
-        mask = ~df['status'].str.lower().str.contains('|'.join(inactive_keywords), na=False)
+            return pd.Series(True, index=df.index)
         
         # Если статус не указан, оставляем (считаем активной)
-        mask = mask | df['status'].isna() | (df['status'] == '')
-        
-        df_filtered = df[mask]
-        
-        removed = initial - len(df_filtered)
-        if removed > 0:
-            logger.info(f"Filtered inactive companies: removed {removed} companies")
-        
-        return df_filtered
+        return _match_categories(
+            df['status'],
+            lambda statuses: statuses.eq('') | ~statuses.str.contains(self._inactive_re),
+            missing=True
+        )
     
     def check_relevance_by_okved(self, df: pd.DataFrame) -> pd.DataFrame:
         """Mark companies as relevant based on OKVED codes."""
@@ -137,16 +136,11 @@ class DataValidator:
             logger.warning("No 'okved_main' column for OKVED check")
             return df
         
-        def is_relevant_okved(okved: str) -> bool:
-            if pd.isna(okved) or okved == '':
-                return False
-            
-            for relevant_code in RELEVANT_OKVED:
-                if okved.startswith(relevant_code):
-                    return True
-            return False
-        
-        df['okved_relevant'] = df['okved_main'].apply(is_relevant_okved)
+        df['okved_relevant'] = _match_categories(
+            df['okved_main'],
+            lambda codes: codes.ne('') & codes.str.startswith(self._relevant_okved),
+            missing=False
+        )
         
         relevant_count = df['okved_relevant'].sum()
         logger.info(f"OKVED relevance check: {relevant_count}/{len(df)} companies have relevant OKVED")
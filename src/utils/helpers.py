@@ -1,22 +1,84 @@
 """Helper utilities."""
 import time
 import re
-from functools import wraps
-from config import REQUEST_DELAY_SECONDS
+import threading
+import unicodedata
+from functools import lru_cache
+from typing import Dict
+from ..config import REQUEST_DELAY_SECONDS, MAX_CONCURRENT_PER_HOST
 from .logger import logger
 
 
-def rate_limit(delay=REQUEST_DELAY_SECONDS):
-    """Decorator to add delay between function calls."""
-    def decorator(func):
-        @wraps(func)
-        def wrapper(*args, **kwargs):
-            time.sleep(delay)
-            return func(*args, **kwargs)
-        return wrapper
-    return decorator
+class TokenBucket:
+    """
+    Thread-safe token bucket.
+
+    Allows bursts of up to ``capacity`` calls, then refills one token
+    every ``delay`` seconds. A single bucket may be shared by many threads.
+    """
+
+    def __init__(self, delay: float = REQUEST_DELAY_SECONDS, capacity: int = 1):
+        self.delay = delay
+        self.capacity = capacity
+        self._tokens = float(capacity)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        """Take one token, sleeping until it becomes available."""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) / self.delay)
+            self._updated = now
+            # Резервируем токен сразу, чтобы следующие потоки ждали за нами
+            self._tokens -= 1
+            wait = -self._tokens * self.delay if self._tokens < 0 else 0
+
+        if wait:
+            time.sleep(wait)
+
+
+class HostRateLimiter:
+    """
+    Thread-safe rate limiter with a separate token bucket per host.
+
+    Calls to the same host are throttled by its bucket, while calls to
+    different hosts never wait for each other.
+    """
+
+    def __init__(self, delay: float = REQUEST_DELAY_SECONDS, capacity: int = 1):
+        self.delay = delay
+        self.capacity = capacity
+        self._buckets: Dict[str, TokenBucket] = {}
+        self._lock = threading.Lock()
+
+    def acquire(self, host: str):
+        """Wait until a request to host is allowed."""
+        with self._lock:
+            bucket = self._buckets.get(host)
+            if bucket is None:
+                bucket = self._buckets[host] = TokenBucket(self.delay, self.capacity)
+
+        bucket.acquire()
+
+
+_host_semaphores: Dict[str, threading.BoundedSemaphore] = {}
+_host_semaphores_lock = threading.Lock()
 
 
+def host_semaphore(host: str, limit: int = MAX_CONCURRENT_PER_HOST) -> threading.BoundedSemaphore:
+    """Get semaphore capping concurrent requests to a host."""
+    with _host_semaphores_lock:
+        if host not in _host_semaphores:
+            _host_semaphores[host] = threading.BoundedSemaphore(limit)
+        return _host_semaphores[host]
+
+
+_RANGE_SPLIT_RE = re.compile(r"[-–]")
+_NUMBER_RE = re.compile(r"(\d+\.?\d*)")
+
+
+@lru_cache(maxsize=8192)
 def normalize_revenue(revenue_str: str) -> int:
     """
     Normalize revenue string to integer.
@@ -37,14 +99,14 @@ def normalize_revenue(revenue_str: str) -> int:
     
     # Handle ranges (take minimum)
     if "-" in s or "–" in s:
-        s = re.split(r"[-–]", s)[0]
+        s = _RANGE_SPLIT_RE.split(s, 1)[0]
     
     # Handle "от" (from)
     if "от" in s:
         s = s.replace("от", "")
     
     # Extract number
-    match = re.search(r"(\d+\.?\d*)", s)
+    match = _NUMBER_RE.search(s)
     if not match:
         return 0
     
@@ -61,6 +123,7 @@ def normalize_revenue(revenue_str: str) -> int:
     return int(num)
 
 
+@lru_cache(maxsize=8192)
 def clean_inn(inn: str) -> str:
     """Clean and validate INN."""
     if not inn:
@@ -77,6 +140,7 @@ def clean_inn(inn: str) -> str:
     return inn_clean
 
 
+@lru_cache(maxsize=8192)
 def clean_text(text: str) -> str:
     """Clean text from extra whitespace."""
     if not text:
@@ -88,6 +152,27 @@ def clean_text(text: str) -> str:
     return text.strip()
 
 
+_NAME_PUNCT_RE = re.compile(r"[\W_]+")
+
+
+@lru_cache(maxsize=8192)
+def normalize_name(name: str) -> str:
+    """
+    Normalize company name into a comparison key.
+    
+    Examples:
+        "ООО «Группа АДВ»" -> "ооо группа адв"
+        "iMARS  Communications" -> "imars communications"
+    """
+    if not name:
+        return ""
+    
+    name = unicodedata.normalize("NFKC", str(name)).casefold().replace("ё", "е")
+    
+    # Пунктуацию и кавычки заменяем пробелами, пробелы схлопываем
+    return " ".join(_NAME_PUNCT_RE.sub(" ", name).split())
+
+
 import pandas as pd
 
 def safe_get(data: dict, *keys, default=None):
@@ -0,0 +1,87 @@
+"""HTTP session utilities."""
+from datetime import timedelta
+from typing import Dict, Optional
+from urllib.parse import urlparse
+
+import requests
+import requests_cache
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from ..config import HTTP_CACHE_FILE, HTTP_CACHE_EXPIRE_DAYS, MAX_CONCURRENT_PER_HOST
+from .helpers import HostRateLimiter, host_semaphore
+
+# Лимитер справочников (Rusprofile, list-org) по хостам для всех потоков:
+# в среднем по 3 секунды между запросами на поток
+ENRICHER_LIMITER = HostRateLimiter(delay=3 / MAX_CONCURRENT_PER_HOST, capacity=MAX_CONCURRENT_PER_HOST)
+
+
+def create_session(headers: Dict[str, str]) -> requests_cache.CachedSession:
+    """Create HTTP session with persistent SQLite cache, pooling and retries."""
+    session = requests_cache.CachedSession(
+        str(HTTP_CACHE_FILE),
+        expire_after=timedelta(days=HTTP_CACHE_EXPIRE_DAYS),
+        # 404 кэшируем тоже, чтобы не искать заново отсутствующие компании
+        allowable_codes=(200, 404),
+        # Устаревшую копию отдаём, если сервер недоступен
+        stale_if_error=True,
+    )
+    session.headers.update(headers)
+
+    # Пул соединений на все потоки и повтор временных ошибок
+    adapter = HTTPAdapter(
+        pool_connections=16,
+        pool_maxsize=32,
+        max_retries=Retry(
+            total=5,
+            backoff_factor=0.5,
+            status_forcelist=[429, 500, 502, 503, 504],
+            allowed_methods=['GET'],
+        ),
+    )
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    return session
+
+
+def _has_validators(response: requests.Response) -> bool:
+    """Check whether a cached response carries ETag/Last-Modified."""
+    return bool(response.headers.get('ETag') or response.headers.get('Last-Modified'))
+
+
+def cached_get(session: requests_cache.CachedSession, url: str,
+               limiter: Optional[HostRateLimiter] = None, **kwargs) -> requests.Response:
+    """
+    GET request that is throttled only when it actually hits the network.
+
+    Cache hits are returned immediately. Stale entries with validators
+    are revalidated with If-None-Match/If-Modified-Since right away: a 304
+    costs the server almost nothing, so it does not wait for the limiter.
+    If the server answers with a full response instead, the limiter is
+    charged afterwards. Real misses wait for the host's turn in the
+    limiter and a free per-host slot.
+    """
+    response = session.get(url, only_if_cached=True, **kwargs)
+    # 504 означает, что ответа нет в кэше
+    cached = response.status_code != 504
+    if cached and not response.is_expired:
+        return response
+
+    host = urlparse(url).netloc
+    revalidating = cached and _has_validators(response)
+    if limiter and not revalidating:
+        limiter.acquire(host)
+    with host_semaphore(host):
+        response = session.get(url, **kwargs)
+
+    # Вместо 304 сервер прислал полный ответ - он тоже расходует токен лимитера,
+    # так что после массового устаревания кэша запросы снова идут в темпе лимитера
+    if limiter and revalidating and not response.from_cache:
+        limiter.acquire(host)
+    return response
+
+
+def enricher_get(session: requests_cache.CachedSession, url: str, **kwargs) -> requests.Response:
+    """Cached GET for enrichers: shared per-host limiter and 30 s timeout."""
+    kwargs.setdefault('timeout', 30)
+    return cached_get(session, url, ENRICHER_LIMITER, **kwargs)
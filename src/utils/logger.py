@@ -1,7 +1,7 @@
 """Logging utility."""
 from loguru import logger
 import sys
-from config import LOG_LEVEL, LOG_FILE
+from ..config import LOG_LEVEL, LOG_FILE
 
 # Remove default handler
 logger.remove()
@@ -0,0 +1,31 @@
+"""Keyword-based segment classification."""
+from typing import Dict, Iterable, Set
+
+import ahocorasick
+
+from ..config import SEGMENT_KEYWORDS
+
+
+class SegmentClassifier:
+    """Match text against segment keywords in a single Aho-Corasick pass."""
+
+    def __init__(self, keywords: Dict[str, Iterable[str]] = SEGMENT_KEYWORDS):
+        segments_by_word: Dict[str, Set[str]] = {}
+        for segment, words in keywords.items():
+            for word in words:
+                segments_by_word.setdefault(word.lower(), set()).add(segment)
+
+        self._automaton = ahocorasick.Automaton()
+        for word, segments in segments_by_word.items():
+            self._automaton.add_word(word, frozenset(segments))
+        self._automaton.make_automaton()
+
+    def classify(self, text: str) -> Set[str]:
+        """Return all segments whose keywords occur in text."""
+        if not text:
+            return set()
+
+        segments = set()
+        for _, matched in self._automaton.iter(text.lower()):
+            segments |= matched
+        return segments
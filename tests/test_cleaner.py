@@ -0,0 +1,72 @@
+"""Tests for DataCleaner."""
+import pandas as pd
+import polars as pl
+import pytest
+
+from src.processors.cleaner import DataCleaner, _normalize_revenue_expr
+from src.utils.helpers import normalize_revenue
+
+
+REVENUE_VALUES = [
+    "200 млн",
+    "200-500 млн",
+    "200–500 млн",
+    "от 500 млн",
+    "1,5 млрд",
+    "1.2 млрд",
+    "300 тыс",
+    "12.7 million",
+    "5 billion",
+    "\n5 billion ",
+    "нет данных",
+    "",
+    250000000,
+    "250000000",
+]
+
+
+@pytest.mark.parametrize("value", REVENUE_VALUES)
+def test_revenue_expr_matches_scalar_helper(value):
+    raw = pl.from_dicts([{"revenue": value}], infer_schema_length=None)
+    result = raw.select(_normalize_revenue_expr()).item()
+    assert result == normalize_revenue(str(value))
+
+
+def test_revenue_expr_missing_is_zero():
+    raw = pl.DataFrame({"revenue": [None, "200 млн"]})
+    assert raw.select(_normalize_revenue_expr()).to_series().to_list() == [0, 200_000_000]
+
+
+def test_clean_companies_mixed_types():
+    companies = [
+        {"name": " Группа  АДВ ", "inn": 7719398064, "revenue": "1.2 млрд",
+         "site": " www.adv-group.ru ", "segment_tag": "BTL"},
+        {"name": "Eventum Premo", "inn": "77-10-700830", "revenue": 850000000,
+         "revenue_year": "2022", "site": "https://eventumpremo.ru", "segment_tag": "BTL"},
+        {"name": "Short INN", "inn": "12345", "revenue": None, "segment_tag": "SOUVENIR"},
+        {"name": None, "inn": "7728916460"},
+        {"name": "   "},
+    ]
+
+    df = DataCleaner().clean_companies(companies)
+
+    assert df["name"].tolist() == ["Группа АДВ", "Eventum Premo", "Short INN"]
+    assert df["inn"].tolist() == ["7719398064", "7710700830", ""]
+    assert df["revenue"].tolist() == [1_200_000_000, 850_000_000, 0]
+    assert df["revenue_year"].tolist() == [2023, 2022, 2023]
+    assert df["site"].tolist() == ["http://www.adv-group.ru", "https://eventumpremo.ru", ""]
+    assert isinstance(df["segment_tag"].dtype, pd.CategoricalDtype)
+
+
+def test_clean_companies_all_null_columns():
+    companies = [
+        {"name": "A", "source": None, "segment_tag": None, "status": None, "region": None},
+        {"name": "B", "source": None, "segment_tag": None, "status": None, "region": None},
+    ]
+
+    df = DataCleaner().clean_companies(companies)
+
+    assert df["source"].tolist() == ["", ""]
+    assert df["segment_tag"].tolist() == ["", ""]
+    assert df["status"].tolist() == ["", ""]
+    assert df["region"].tolist() == ["", ""]
@@ -0,0 +1,62 @@
+"""Tests for Deduplicator."""
+import numpy as np
+import pandas as pd
+
+from src.processors.deduplicator import Deduplicator
+
+
+def _reference_deduplicate(df: pd.DataFrame) -> pd.DataFrame:
+    """Sort by revenue, then keep the first record per INN (or per name without INN)."""
+    df = df.sort_values(["revenue", "revenue_year"], ascending=False, kind="mergesort")
+    seen = set()
+    keep = []
+    for inn, name in zip(df["inn"], df["name"]):
+        key = ("I", inn) if inn else ("N", name.lower().strip())
+        keep.append(key not in seen)
+        seen.add(key)
+    return df[keep].reset_index(drop=True)
+
+
+def test_keeps_highest_revenue_per_inn_and_name():
+    df = pd.DataFrame([
+        {"inn": "1234567890", "name": "Company A", "revenue": 1_000_000, "revenue_year": 2023},
+        {"inn": "1234567890", "name": "Company A", "revenue": 2_000_000, "revenue_year": 2023},
+        {"inn": "", "name": "Company B", "revenue": 500_000, "revenue_year": 2023},
+        {"inn": "", "name": "company b ", "revenue": 600_000, "revenue_year": 2023},
+        {"inn": "9876543210", "name": "Company B", "revenue": 300_000, "revenue_year": 2023},
+    ])
+
+    result = Deduplicator().deduplicate(df)
+
+    assert result[["inn", "revenue"]].values.tolist() == [
+        ["1234567890", 2_000_000],
+        ["", 600_000],
+        ["9876543210", 300_000],
+    ]
+
+
+def test_matches_reference_on_random_frame():
+    rng = np.random.default_rng(0)
+    size = 2000
+    df = pd.DataFrame({
+        "inn": rng.choice(["", "1111111111", "2222222222", "3333333333"], size),
+        "name": rng.choice(["a", "b", "B ", "c", "d"], size),
+        "revenue": rng.integers(0, 50, size),
+        "revenue_year": rng.integers(2020, 2024, size),
+    }, index=rng.permutation(size))
+
+    result = Deduplicator().deduplicate(df)
+
+    pd.testing.assert_frame_equal(result, _reference_deduplicate(df))
+
+
+def test_does_not_modify_input():
+    df = pd.DataFrame([
+        {"inn": "", "name": "A", "revenue": 1, "revenue_year": 2023},
+        {"inn": "", "name": "a", "revenue": 2, "revenue_year": 2023},
+    ])
+    original = df.copy()
+
+    Deduplicator().deduplicate(df)
+
+    pd.testing.assert_frame_equal(df, original)
@@ -0,0 +1,53 @@
+"""Tests for enricher request deduplication."""
+from src.enrichers.listorg_enricher import ListOrgEnricher
+from src.enrichers.rusprofile_enricher import RusprofileEnricher
+
+
+COMPANIES = [
+    {'name': 'ООО «Группа АДВ»', 'segment_tag': 'BTL'},
+    {'name': 'ооо группа  АДВ', 'segment_tag': 'EVENT'},
+    {'name': 'Deltaplan', 'inn': '7701234567', 'segment_tag': 'BTL'},
+    {'name': 'Unknown', 'segment_tag': 'DIGITAL'},
+]
+
+
+def _fake(enricher, monkeypatch, details_method):
+    searched, fetched = [], []
+
+    def search_company(name):
+        searched.append(name)
+        return {'inn': '7707654321'} if 'АДВ' in name else None
+
+    def details(inn):
+        fetched.append(inn)
+        return {'revenue': 1_000}
+
+    monkeypatch.setattr(enricher, 'search_company', search_company)
+    monkeypatch.setattr(enricher, details_method, details)
+    monkeypatch.setattr(enricher, 'save_enriched_data', lambda companies: None)
+    return searched, fetched
+
+
+def test_rusprofile_searches_each_normalized_name_once(monkeypatch):
+    enricher = RusprofileEnricher()
+    searched, fetched = _fake(enricher, monkeypatch, 'get_company_details')
+
+    enriched = enricher.enrich_companies(COMPANIES)
+
+    assert sorted(searched) == ['Unknown', 'ООО «Группа АДВ»']
+    assert sorted(fetched) == ['7701234567', '7707654321']
+    # Дубликаты по названию не теряются: каждая строка получает результат поиска
+    assert [c['segment_tag'] for c in enriched] == ['BTL', 'EVENT', 'BTL']
+    assert [c['inn'] for c in enriched] == ['7707654321', '7707654321', '7701234567']
+    assert all(c['revenue'] == 1_000 for c in enriched)
+
+
+def test_listorg_searches_each_normalized_name_once(monkeypatch):
+    enricher = ListOrgEnricher()
+    searched, fetched = _fake(enricher, monkeypatch, 'get_financials')
+
+    enriched = enricher.enrich_companies(COMPANIES)
+
+    assert sorted(searched) == ['Unknown', 'ООО «Группа АДВ»']
+    assert sorted(fetched) == ['7701234567', '7707654321']
+    assert [c['segment_tag'] for c in enriched] == ['BTL', 'EVENT', 'BTL']
@@ -0,0 +1,81 @@
+"""Tests for TokenBucket reservation math on a fake clock."""
+import pytest
+
+from src.utils import helpers
+
+
+class FakeClock:
+    """Replaces the time module in helpers; sleep advances the clock if asked."""
+
+    def __init__(self, advance_on_sleep=True):
+        self.now = 100.0
+        self.sleeps = []
+        self.advance_on_sleep = advance_on_sleep
+
+    def monotonic(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        if self.advance_on_sleep:
+            self.now += seconds
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(helpers, 'time', clock)
+    return clock
+
+
+def test_burst_up_to_capacity_does_not_wait(clock):
+    bucket = helpers.TokenBucket(delay=1.5, capacity=2)
+
+    bucket.acquire()
+    bucket.acquire()
+
+    assert clock.sleeps == []
+
+
+def test_call_after_burst_waits_one_delay(clock):
+    bucket = helpers.TokenBucket(delay=1.5, capacity=2)
+    bucket.acquire()
+    bucket.acquire()
+
+    bucket.acquire()
+
+    assert clock.sleeps == [pytest.approx(1.5)]
+
+
+def test_concurrent_reservations_stack(clock):
+    # Потоки резервируют токены до того, как кто-то из них проснётся
+    clock.advance_on_sleep = False
+    bucket = helpers.TokenBucket(delay=1.5, capacity=2)
+
+    for _ in range(5):
+        bucket.acquire()
+
+    assert clock.sleeps == [pytest.approx(1.5), pytest.approx(3.0), pytest.approx(4.5)]
+
+
+def test_refill_is_capped_at_capacity(clock):
+    bucket = helpers.TokenBucket(delay=1.5, capacity=2)
+    bucket.acquire()
+    bucket.acquire()
+
+    # Долгий простой не накапливает больше capacity токенов
+    clock.now += 60
+    for _ in range(3):
+        bucket.acquire()
+
+    assert clock.sleeps == [pytest.approx(1.5)]
+
+
+def test_hosts_have_separate_buckets(clock):
+    limiter = helpers.HostRateLimiter(delay=2)
+
+    limiter.acquire('a.example')
+    limiter.acquire('b.example')
+    limiter.acquire('a.example')
+
+    assert clock.sleeps == [pytest.approx(2)]
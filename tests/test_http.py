@@ -0,0 +1,110 @@
+"""Tests for cached_get limiter accounting against a local HTTP server."""
+import threading
+from datetime import timedelta
+from http.server import BaseHTTPRequestHandler, HTTPServer
+
+import pytest
+
+from src.utils import http
+
+
+class CountingLimiter:
+    """Records hosts instead of sleeping."""
+
+    def __init__(self):
+        self.calls = []
+
+    def acquire(self, host):
+        self.calls.append(host)
+
+
+class Handler(BaseHTTPRequestHandler):
+    # ETag, который сервер считает актуальным; None - каждый ответ с новым ETag
+    etag = '"v1"'
+    hits = 0
+
+    def do_GET(self):
+        type(self).hits += 1
+        if self.etag and self.headers.get('If-None-Match') == self.etag:
+            self.send_response(304)
+            self.end_headers()
+            return
+        self.send_response(200)
+        self.send_header('ETag', self.etag or f'"v{self.hits}"')
+        self.send_header('Content-Length', '4')
+        self.end_headers()
+        self.wfile.write(b'page')
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def server():
+    Handler.etag, Handler.hits = '"v1"', 0
+    srv = HTTPServer(('127.0.0.1', 0), Handler)
+    threading.Thread(target=srv.serve_forever, daemon=True).start()
+    yield f'127.0.0.1:{srv.server_port}'
+    srv.shutdown()
+    srv.server_close()
+
+
+@pytest.fixture
+def session(tmp_path, monkeypatch):
+    monkeypatch.setattr(http, 'HTTP_CACHE_FILE', tmp_path / 'http_cache.sqlite')
+    session = http.create_session({})
+    yield session
+    session.close()
+
+
+def _expire_cache(session):
+    session.cache.reset_expiration(timedelta(seconds=-1))
+
+
+def test_miss_waits_for_limiter(server, session):
+    limiter = CountingLimiter()
+
+    response = http.cached_get(session, f'http://{server}/a', limiter, timeout=5)
+
+    assert response.status_code == 200
+    assert not response.from_cache
+    assert limiter.calls == [server]
+
+
+def test_fresh_hit_skips_limiter(server, session):
+    limiter = CountingLimiter()
+    http.cached_get(session, f'http://{server}/a', limiter, timeout=5)
+
+    response = http.cached_get(session, f'http://{server}/a', limiter, timeout=5)
+
+    assert response.from_cache
+    assert Handler.hits == 1
+    assert limiter.calls == [server]
+
+
+def test_etag_304_skips_limiter(server, session):
+    limiter = CountingLimiter()
+    http.cached_get(session, f'http://{server}/a', limiter, timeout=5)
+    _expire_cache(session)
+
+    response = http.cached_get(session, f'http://{server}/a', limiter, timeout=5)
+
+    assert response.content == b'page'
+    assert response.from_cache
+    assert Handler.hits == 2
+    # Токен расходован только на первый (полный) запрос
+    assert limiter.calls == [server]
+
+
+def test_full_200_on_revalidation_charges_limiter(server, session):
+    Handler.etag = None
+    limiter = CountingLimiter()
+    http.cached_get(session, f'http://{server}/a', limiter, timeout=5)
+    _expire_cache(session)
+
+    response = http.cached_get(session, f'http://{server}/a', limiter, timeout=5)
+
+    assert response.status_code == 200
+    assert not response.from_cache
+    assert Handler.hits == 2
+    assert limiter.calls == [server, server]
@@ -0,0 +1,56 @@
+"""Tests for RRARCollector page parsing."""
+from src.collectors.rrar_collector import RRARCollector
+
+
+TABLE_PAGE = (
+    '<html><body><table class="rating-table">'
+    '<tr><th>#</th><th>Компания</th></tr>'
+    '<tr><td>1</td><td>Группа АДВ</td></tr>'
+    '<tr><td>2</td><td><a>Deltaplan</a></td></tr>'
+    '</table></body></html>'
+)
+
+
+def test_parse_table_rows():
+    companies = RRARCollector().parse_rrar_page(TABLE_PAGE.encode('utf-8'), 'btl')
+
+    assert [c['name'] for c in companies] == ['Группа АДВ', 'Deltaplan']
+    assert companies[0]['segment_tag'] == 'BTL'
+    assert companies[0]['rating_ref'] == 'rrar_btl'
+
+
+def test_parse_uses_header_encoding():
+    # Кодировка cp1251 указана только в заголовке Content-Type, <meta charset> нет
+    companies = RRARCollector().parse_rrar_page(TABLE_PAGE.encode('cp1251'), 'btl', encoding='cp1251')
+
+    assert [c['name'] for c in companies] == ['Группа АДВ', 'Deltaplan']
+
+
+def test_fetch_page_returns_header_encoding(monkeypatch):
+    class Response:
+        content = TABLE_PAGE.encode('cp1251')
+        encoding = 'windows-1251'
+        apparent_encoding = 'utf-8'
+
+        def raise_for_status(self):
+            pass
+
+    monkeypatch.setattr('src.collectors.rrar_collector.cached_get', lambda *args, **kwargs: Response())
+    collector = RRARCollector()
+    content, encoding = collector.fetch_page('https://www.raso.ru/rating/btl/')
+
+    assert encoding == 'windows-1251'
+    assert [c['name'] for c in collector.parse_rrar_page(content, 'btl', encoding)] == ['Группа АДВ', 'Deltaplan']
+
+
+def test_parse_company_blocks_without_table():
+    page = (
+        '<html><body>'
+        '<div class="company-item"><h3>Link co</h3><a>ignored</a></div>'
+        '<div class="company-item"><a>Zebra</a></div>'
+        '</body></html>'
+    ).encode('utf-8')
+
+    companies = RRARCollector().parse_rrar_page(page, 'souvenir')
+
+    assert [c['name'] for c in companies] == ['Link co', 'Zebra']
@@ -0,0 +1,118 @@
+"""Tests for DataValidator filters."""
+import pandas as pd
+import pyarrow as pa
+import pytest
+
+from src.processors.validator import DataValidator
+from src.utils.logger import logger
+
+
+def _frame(**overrides):
+    data = {
+        'name': ['A', 'B', 'C', 'D', 'E', 'F'],
+        'revenue': [300, 100, 300, 300, 300, 300],
+        'region': ['Москва', 'Москва', 'USA', 'Казань', 'Москва', 'г. Санкт-Петербург'],
+        'segment_tag': ['BTL', 'BTL', 'BTL', 'INVALID', 'EVENT', 'SOUVENIR'],
+        'status': ['Действующая', 'Действующая', 'Действующая', 'Действующая', 'Ликвидирована', 'Действующая'],
+    }
+    data.update(overrides)
+    return pd.DataFrame(data)
+
+
+def _arrow(df):
+    return df.astype({
+        column: pd.ArrowDtype(pa.string())
+        for column in df.columns if df[column].dtype == object
+    })
+
+
+@pytest.fixture
+def messages():
+    messages = []
+    sink = logger.add(lambda message: messages.append(message.record['message']), level='INFO')
+    yield messages
+    logger.remove(sink)
+
+
+# chunk1-18: одна маска на правило, удалённые считаются только среди прошедших предыдущие
+def test_validate_logs_removed_per_rule(messages):
+    result = DataValidator(min_revenue=200).validate(_frame())
+
+    assert result['name'].tolist() == ['A', 'F']
+    assert "Filtered by country: removed 1 non-Russian companies" in messages
+    assert "Filtered by revenue (>= 200): removed 1 companies" in messages
+    assert "Segment validation: removed 1 companies with invalid segments" in messages
+    assert "Filtered inactive companies: removed 1 companies" in messages
+    assert "Validation complete. Removed 4 records. Final: 2 records" in messages
+
+
+def test_validate_counts_each_row_once(messages):
+    # Строка не прошла бы ни одно правило - считается первым
+    df = _frame(region=['USA'] * 6, revenue=[100] * 6)
+
+    result = DataValidator(min_revenue=200).validate(df)
+
+    assert result.empty
+    assert "Filtered by country: removed 6 non-Russian companies" in messages
+    assert not any(message.startswith("Filtered by revenue") for message in messages)
+
+
+# chunk1-12: пустые и пропущенные регион и статус не отбрасываются
+@pytest.mark.parametrize('convert', [lambda df: df, _arrow], ids=['object', 'arrow'])
+def test_empty_and_missing_region_and_status_are_kept(convert):
+    df = convert(_frame(
+        region=['', None, 'USA', 'Москва', 'Москва', 'Москва'],
+        status=['Действующая', 'Действующая', 'Действующая', 'Действующая', '', None],
+        segment_tag=['BTL'] * 6,
+        revenue=[300] * 6,
+    ))
+
+    result = DataValidator(min_revenue=200).validate(df)
+
+    assert result['name'].tolist() == ['A', 'B', 'D', 'E', 'F']
+
+
+# chunk1-20: колонка из одних пропусков без категорий
+def test_all_missing_region_and_status_are_kept():
+    df = _arrow(_frame(region=[None] * 6, status=[None] * 6, segment_tag=['BTL'] * 6, revenue=[300] * 6))
+
+    result = DataValidator(min_revenue=200).validate(df)
+
+    assert len(result) == 6
+
+
+# chunk1-4, chunk1-8, chunk1-17, chunk1-20: одинаковый результат для object, категорий и Arrow-строк
+@pytest.mark.parametrize('convert', [
+    lambda df: df,
+    lambda df: df.astype({'region': 'category', 'segment_tag': 'category', 'status': 'category'}),
+    _arrow,
+], ids=['object', 'category', 'arrow'])
+def test_validate_same_result_for_any_string_dtype(convert):
+    result = DataValidator(min_revenue=200).validate(convert(_frame()))
+
+    assert result['name'].astype(str).tolist() == ['A', 'F']
+
+
+# chunk1-4: ключевые слова сопоставляются без учёта регистра
+def test_keywords_are_case_insensitive():
+    df = _frame(region=['МОСКВА', 'russia', 'USA', 'Москва', 'Москва', 'Москва'],
+                status=['Действующая', 'Действующая', 'Действующая', 'Действующая', 'ЛИКВИДИРОВАНА', 'Действующая'],
+                segment_tag=['BTL'] * 6, revenue=[300] * 6)
+
+    result = DataValidator(min_revenue=200).validate(df)
+
+    assert result['name'].tolist() == ['A', 'B', 'D', 'F']
+
+
+# chunk1-5, chunk1-8: ОКВЭД сравнивается по префиксу, пропуски и пустые строки не релевантны
+@pytest.mark.parametrize('convert', [
+    lambda s: s,
+    lambda s: s.astype('category'),
+    lambda s: s.astype(pd.ArrowDtype(pa.string())),
+], ids=['object', 'category', 'arrow'])
+def test_okved_prefix_matching(convert):
+    df = pd.DataFrame({'okved_main': convert(pd.Series(['73.11', '73.11.1', '73.1', '82.30.9', '', None, '01.73.11']))})
+
+    result = DataValidator().check_relevance_by_okved(df)
+
+    assert result['okved_relevant'].tolist() == [True, True, False, True, False, False, False]